@@ -1,8 +1,8 @@
 from abc import abstractmethod
 from dataclasses import dataclass
-import queue
+import socket
 import struct
-from typing import ByteString, TypeVar
+from typing import ByteString, ClassVar, TypeVar
 
 import numpy as np
 from durin import io
@@ -14,10 +14,21 @@ from durin.controller import *
 
 T = TypeVar("T")
 
+# Precompiled little-endian wire formats for the command encoders
+_MOVE_STRUCT = struct.Struct("<Bhhh")  # cmd_id, vel_x, vel_y, rot
+_MOVE_WHEELS_STRUCT = struct.Struct("<Bhhhh")  # cmd_id, se, sw, ne, nw
+_STREAM_ON_STRUCT = struct.Struct("<B4sHH")  # cmd_id, ip, port, period
+
 
 @dataclass
 class Command:
-    pass
+    # Commands are constructed on every control tick, so subclasses declare
+    # __slots__ and keep the constant cmd_id on the class
+    __slots__ = ()
+    cmd_id: ClassVar[int]
+    # Motion commands only matter until the next one is issued, so an unsent
+    # command is replaced rather than queued
+    latest_only: ClassVar[bool] = False
 
     @abstractmethod
     def encode() -> ByteString:
@@ -25,17 +36,18 @@ class Command:
 
 
 class PowerOff(Command):
-    def __init__(self):
-        self.cmd_id = 1
+    __slots__ = ()
+    cmd_id = 1
 
     def encode(self):
-        data = bytearray([0] * 1)
-        data[0] = self.cmd_id
-
-        return data
+        return bytes((self.cmd_id,))
 
 
 class Move(Command):
+    __slots__ = ("vel_x", "vel_y", "rot")
+    cmd_id = 2
+    latest_only = True
+
     def __init__(self, vel_x: int, vel_y: int, rot: int):
         """
         Moves Durin
@@ -45,25 +57,12 @@ class Move(Command):
             vel_y (int): Velocity in the y axis
             rot (int): Degrees per second
         """
-        self.cmd_id = 2
         self.vel_x = int(vel_x)
         self.vel_y = int(vel_y)
         self.rot = int(rot)
 
     def encode(self):
-        data = bytearray([0] * 7)
-        data[0] = self.cmd_id
-        data[1:3] = bytearray(
-            struct.pack("<h", self.vel_x)
-        )  # short (int16) little endian
-        data[3:5] = bytearray(
-            struct.pack("<h", self.vel_y)
-        )  # short (int16) little endian
-        data[5:7] = bytearray(
-            struct.pack("<h", -self.rot)
-        )  # short (int16) little endian
-
-        return data
+        return _MOVE_STRUCT.pack(self.cmd_id, self.vel_x, self.vel_y, -self.rot)
 
     def __repr__(self) -> str:
         return f"Move({self.vel_x}, {self.vel_y}, {-self.rot})"
@@ -80,106 +79,80 @@ class MoveWheels(Command):
         se (float): South east wheel
     """
 
+    __slots__ = ("ne", "nw", "sw", "se")
+    cmd_id = 3
+    latest_only = True
+
     def __init__(self, ne, nw, sw, se):
-        self.cmd_id = 3
         self.ne = int(ne)
         self.nw = int(nw)
         self.sw = int(sw)
         self.se = int(se)
 
     def encode(self):
-        data = bytearray([0] * 9)
-        data[0] = self.cmd_id
-        data[1:3] = bytearray(
-            struct.pack("<h", -self.se)
-        )  # short (int16) little endian
-        data[3:5] = bytearray(
-            struct.pack("<h", self.sw)
-        )  # short (int16) little endian
-        data[5:7] = bytearray(
-            struct.pack("<h", -self.ne)
-        )  # short (int16) little endian
-        data[7:9] = bytearray(
-            struct.pack("<h", self.nw)
-        )  # short (int16) little endian
-        return data
+        return _MOVE_WHEELS_STRUCT.pack(
+            self.cmd_id, -self.se, self.sw, -self.ne, self.nw
+        )
 
     def __repr__(self) -> str:
         return f"MoveWheels({self.ne}, {self.nw}, {self.sw}, {self.se})"
 
 
 class PollAll(Command):
-    def __init__(self):
-        self.cmd_id = 16
+    __slots__ = ()
+    cmd_id = 16
 
     def encode(self):
-        data = bytearray([0] * 1)
-        data[0] = self.cmd_id
-
-        return data
+        return bytes((self.cmd_id,))
 
 
 class PollSensor(Command):
+    __slots__ = ("sensor_id",)
+    cmd_id = 17
+
     def __init__(self, sensor_id):
-        self.cmd_id = 17
         self.sensor_id = int(sensor_id)
 
     def encode(self):
-        data = bytearray([0] * 2)
-        data[0] = self.cmd_id
-        data[1:2] = self.sensor_id.to_bytes(
-            1, "little"
-        )  # integer (uint8) little endian
-
-        return data
+        return bytes((self.cmd_id, self.sensor_id))
 
 
 class StreamOn(Command):
+    __slots__ = ("host", "port", "period", "_ip_bytes")
+    cmd_id = 18
+
     def __init__(self, host, port, period):
-        self.cmd_id = 18
         self.host = host
         self.port = port
         self.period = period
+        # The host is fixed, so pack its octets once
+        self._ip_bytes = socket.inet_aton(host)
 
     def encode(self):
-        data = bytearray([0] * 9)
-        data[0] = self.cmd_id
-        host = self.host.split(".")
-        data[1] = int(host[0])
-        data[2] = int(host[1])
-        data[3] = int(host[2])
-        data[4] = int(host[3])
-        data[5:7] = self.port.to_bytes(2, "little")
-        data[7:9] = self.period.to_bytes(2, "little")
-        return data
+        return _STREAM_ON_STRUCT.pack(
+            self.cmd_id, self._ip_bytes, self.port, self.period
+        )
 
 
 class StreamOff(Command):
-    def __init__(self):
-        self.cmd_id = 19
+    __slots__ = ()
+    cmd_id = 19
 
     def encode(self):
-        data = bytearray([0] * 1)
-        data[0] = self.cmd_id
-
-        return data
+        return bytes((self.cmd_id,))
 
 
 class DurinActuator:
     def __init__(self, tcp_link: TCPLink):
         self.tcp_link = tcp_link
 
-    def __call__(self, action: Command, timeout: float = 0.05):
+    def __call__(self, action: Command):
         command_bytes = action.encode()
         reply = []
         if command_bytes[0] == 0:
             return reply
 
-        try:
-            self.tcp_link.send(command_bytes, timeout=timeout)
-        except queue.Full:
-            pass
-
+        self.tcp_link.send(command_bytes, latest_only=action.latest_only)
         return None
 
     def read(self):
@@ -1,13 +1,20 @@
 import ipaddress
 import logging
-from queue import Empty, Full
+from queue import Empty
 import socket
+import struct
 import multiprocessing
 from typing import ByteString, Optional, Tuple
-from durin import io
 
+from durin.io.ringbuffer import SensorRing
 from durin.io.runnable import RunnableConsumer, RunnableProducer
 
+# Start-stream message for the DVS controller: cmd_id, ip (uint32), port
+_DVS_START_STRUCT = struct.Struct("<BIH")
+
+# Size of the slot holding the latest motion command
+_MOTION_SLOT_SIZE = 16
+
 
 def get_ip(ip):
     # Thanks to https://stackoverflow.com/a/28950776/999865
@@ -24,32 +31,72 @@ def get_ip(ip):
 
 
 class TCPProducer(RunnableProducer):
+    def __init__(self, queue, sock, package_size: int = 512):
+        # Receive buffer reused across reads. The memoryview is created lazily
+        # in the worker process, since memoryviews cannot be pickled
+        self._recv_buf = bytearray(package_size)
+        self._recv_mv = None
+        super().__init__(queue, sock)
+
     def produce(self, sock):
+        if self._recv_mv is None:
+            self._recv_mv = memoryview(self._recv_buf)
         try:
-            return sock.recv(512)
+            n = sock.recv_into(self._recv_mv)
+            return bytes(self._recv_mv[:n])
         except BlockingIOError:
             return None
 
 
 class TCPConsumer(RunnableConsumer):
-    def consume(self, event, sock):
-        sock.send(event)
+    def run(self, sock, motion, motion_size):
+        # Collect the latest motion command and every pending control command so
+        # they go out in a single syscall. Commands are self-delimited
+        # (cmd_id + fixed length), so they can be concatenated safely.
+        # Control commands are sent after the motion, so e.g. PowerOff comes last
+        chunks = []
+        with motion.get_lock():
+            if motion_size.value > 0:
+                chunks.append(bytes(motion[: motion_size.value]))
+                motion_size.value = 0
+        while True:
+            try:
+                chunks.append(self.queue.get(block=False))
+            except Empty:
+                break
+        if len(chunks) > 0:
+            self.consume(b"".join(chunks), sock, motion, motion_size)
+
+    def consume(self, event, sock, motion, motion_size):
+        sock.sendall(event)
 
 
 class TCPLink:
-    """ """
+    """
+    A TCP connection to Durin. Control commands are queued and never dropped,
+    while motion commands share a single slot where the most recent one wins.
+
+    Arguments:
+        host (str): The IPv4 address of Durin
+        port (str): The TCP port of Durin
+        buffer_size_send (int): Maximum number of queued control commands. Sending blocks while the buffer is full. Defaults to 0 (unbounded).
+        buffer_size_receive (int): Maximum number of buffered replies. Defaults to 100.
+    """
 
     def __init__(
         self,
         host: str,
         port: str,
-        buffer_size_send: int = 2,
+        buffer_size_send: int = 0,
         buffer_size_receive: int = 100,
     ):
         self.address = (host, int(port))
         context = multiprocessing.get_context("spawn")
-        # Buffer towards Durin
+        # Control commands towards Durin
         self.buffer_send = context.Queue(buffer_size_send)
+        # Latest motion command towards Durin, guarded by the array lock
+        self.motion = context.Array("B", _MOTION_SLOT_SIZE)
+        self.motion_size = context.RawValue("i", 0)
         # Buffer receiving replies
         self.buffer_receive = context.Queue(buffer_size_receive)
 
@@ -57,12 +104,16 @@ class TCPLink:
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         try:
             self.sock.connect(self.address)
+            # Commands are small and time-critical, so disable Nagle's algorithm
+            self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
             self.sock.setblocking(False)
         except (ConnectionRefusedError, OSError) as e:
             raise ConnectionRefusedError(f"Cannot reach Durin at {self.address}")
 
         # Create producer/consumer
-        self.sender = TCPConsumer(self.buffer_send, self.sock)
+        self.sender = TCPConsumer(
+            self.buffer_send, self.sock, self.motion, self.motion_size
+        )
         self.receiver = TCPProducer(self.buffer_receive, self.sock)
 
     def start(self):
@@ -77,11 +128,20 @@ class TCPLink:
         self.receiver.stop()
         logging.debug(f"TCP control communication stopped")
 
-    def send(self, command: ByteString, timeout: float) -> None:
-        try:
-            self.buffer_send.put(command, block=False, timeout=timeout)
-        except Full:
-            return None
+    def send(self, command: ByteString, latest_only: bool = False) -> None:
+        """
+        Sends a command to Durin.
+
+        Arguments:
+            command (ByteString): The encoded command
+            latest_only (bool): Overwrite any unsent command of the same kind instead of queueing. Used for motion commands. Defaults to False.
+        """
+        if latest_only:
+            with self.motion.get_lock():
+                self.motion[: len(command)] = command
+                self.motion_size.value = len(command)
+        else:
+            self.buffer_send.put(command)
 
     def read(self) -> Optional[ByteString]:
         try:
@@ -92,7 +152,7 @@ class TCPLink:
 
 class UDPLink(RunnableProducer):
     """
-    An UDPBuffer that silently buffers messages received over UDP into a queue.
+    An UDPBuffer that silently buffers messages received over UDP into a shared memory ring.
     """
 
     def __init__(
@@ -100,24 +160,36 @@ class UDPLink(RunnableProducer):
     ):
         self.buffer_size = buffer_size
         self.package_size = package_size
-        context = multiprocessing.get_context("spawn")
-        self.buffer = context.Queue(self.buffer_size)
+        self.buffer = SensorRing(self.buffer_size, self.package_size)
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, "SO_REUSEPORT"):  # Not available on Windows
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        # Enlarge the kernel buffer to avoid dropping bursts of sensor packets
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 * 1024 * 1024)
         address = (host, ip)
         self.sock.bind(address)
         self.sock.setblocking(0)
         logging.debug(f"UDP control receiving on {address}")
+        # Receive buffer reused across packets, see TCPProducer
+        self._recv_buf = bytearray(self.package_size)
+        self._recv_mv = None
 
         super().__init__(self.buffer, self.sock)
 
     def produce(self, sock):
-        try:
-            buffer, _ = sock.recvfrom(self.package_size)
-            sensor_id, reply = io.decode(buffer)
-            return (sensor_id, reply)
-        except BlockingIOError:
-            return None
+        if self._recv_mv is None:
+            self._recv_mv = memoryview(self._recv_buf)
+        # Drain the socket on every wakeup and copy the raw packets straight into
+        # the ring; decoding happens in the consumer process. Packets are dropped
+        # while the ring is full
+        while True:
+            try:
+                n, _ = sock.recvfrom_into(self._recv_mv)
+            except BlockingIOError:
+                break
+            self.buffer.write(self._recv_mv[:n])
+        return None
 
     def stop(self):
         super().stop()
@@ -150,10 +222,7 @@ class DVSClient:
             self._send_message(message)
 
     def start_stream(self, host: str, port: int):
-        data = bytearray([0] * 7)
-        data[0] = 0x0
-        data[1:5] = int(ipaddress.ip_address(host)).to_bytes(4, "little")
-        data[5:7] = port.to_bytes(2, "little")
+        data = _DVS_START_STRUCT.pack(0x0, int(ipaddress.ip_address(host)), port)
         self._send_message(data)
 
     def stop_stream(self):
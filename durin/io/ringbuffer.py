@@ -1,3 +1,8 @@
+import multiprocessing
+import queue
+import time
+from typing import Optional
+
 import numpy as np
 
 
@@ -12,3 +17,87 @@ class RingBuffer(object):
         self.counter += 1
         self.counter = self.counter % self.size
         return self.buffer
+
+
+class SensorRing(object):
+    """
+    A single-producer, single-consumer ring of fixed-size messages in shared memory.
+    Messages are copied into preallocated slots instead of being pickled through a pipe.
+    The producer only advances the tail and the consumer only advances the head.
+    Both counters are read and written under their locks, which act as the memory
+    barriers that order the payload writes before the tail is published.
+
+    Arguments:
+        capacity (int): The number of messages the ring can hold
+        msg_size (int): The maximum size of a single message in bytes
+    """
+
+    def __init__(self, capacity: int = 100, msg_size: int = 512):
+        self.capacity = capacity
+        self.msg_size = msg_size
+        context = multiprocessing.get_context("spawn")
+        self.data = context.RawArray("B", capacity * msg_size)
+        self.sizes = context.RawArray("H", capacity)
+        # Synchronized values: every .value access takes the lock
+        self.head = context.Value("Q", 0)
+        self.tail = context.Value("Q", 0)
+        # Created lazily in each process, since memoryviews cannot be pickled
+        self._view = None
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state["_view"] = None
+        return state
+
+    def _buffer(self) -> memoryview:
+        if self._view is None:
+            self._view = memoryview(self.data).cast("B")
+        return self._view
+
+    def write(self, message) -> bool:
+        """
+        Copies a message into the ring. Returns False if the ring is full and the
+        message was dropped.
+        """
+        tail = self.tail.value
+        if tail - self.head.value >= self.capacity:
+            return False
+        offset = (tail % self.capacity) * self.msg_size
+        size = len(message)
+        self._buffer()[offset : offset + size] = message
+        self.sizes[tail % self.capacity] = size
+        # Publish the message only after it has been written
+        self.tail.value = tail + 1
+        return True
+
+    def get(self, block: bool = True, timeout: Optional[float] = None):
+        """
+        Returns all pending messages as a list of bytes, mirroring the
+        multiprocessing.Queue interface used by RunnableConsumer.
+        Raises queue.Empty if there are no messages, after waiting up to timeout
+        seconds if block is True.
+        """
+        head = self.head.value
+        tail = self.tail.value
+        if head == tail and block:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            while head == tail:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                time.sleep(0.001)
+                tail = self.tail.value
+        if head == tail:
+            raise queue.Empty
+        buffer = self._buffer()
+        messages = []
+        for index in range(head, tail):
+            slot = index % self.capacity
+            offset = slot * self.msg_size
+            messages.append(bytes(buffer[offset : offset + self.sizes[slot]]))
+        self.head.value = tail
+        return messages
+
+    def close(self):
+        if self._view is not None:
+            self._view.release()
+            self._view = None
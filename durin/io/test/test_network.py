@@ -0,0 +1,53 @@
+import socket
+import time
+
+from durin.io.network import TCPLink
+
+# Lengths of the commands used below, keyed on cmd_id
+COMMAND_LENGTHS = {1: 1, 2: 7, 16: 1, 17: 2, 19: 1}
+
+
+def split_commands(data):
+    commands = []
+    while len(data) > 0:
+        length = COMMAND_LENGTHS[data[0]]
+        commands.append(data[:length])
+        data = data[length:]
+    return commands
+
+
+def test_tcp_link_burst():
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    link = TCPLink("127.0.0.1", server.getsockname()[1])
+    connection, _ = server.accept()
+    link.start()
+
+    control = [bytes([17, 128]), bytes([16]), bytes([1]), bytes([19])]
+    moves = [bytes([2, i, 0, 0, 0, 0, 0]) for i in range(20)]
+    for command in control:
+        link.send(command)
+    for command in moves:
+        link.send(command, latest_only=True)
+    time.sleep(1)
+
+    connection.settimeout(0.5)
+    received = b""
+    try:
+        while True:
+            data = connection.recv(4096)
+            if len(data) == 0:
+                break
+            received += data
+    except socket.timeout:
+        pass
+    link.stop()
+    connection.close()
+    server.close()
+
+    commands = split_commands(received)
+    # No control command is dropped and their order is kept
+    assert [c for c in commands if c[0] != 2] == control
+    # The most recent motion command is always sent
+    assert [c for c in commands if c[0] == 2][-1] == moves[-1]
@@ -1,6 +1,10 @@
+import multiprocessing
+import queue
+
 import numpy as np
+import pytest
 
-from durin.io.ringbuffer import RingBuffer
+from durin.io.ringbuffer import RingBuffer, SensorRing
 
 
 def test_ringbuffer():
@@ -12,3 +16,43 @@ def test_ringbuffer():
 
     assert np.allclose(b.buffer, np.array([[1, 2], [1, 2], [1, 2], [1, 2], [1, 2]]))
     assert b.buffer.mean() == 1.5
+
+
+def test_sensor_ring():
+    r = SensorRing(capacity=3, msg_size=4)
+    with pytest.raises(queue.Empty):
+        r.get(block=False)
+    assert r.write(b"ab")
+    assert r.write(b"cdef")
+    assert r.get() == [b"ab", b"cdef"]
+    with pytest.raises(queue.Empty):
+        r.get(timeout=0.01)
+
+
+def test_sensor_ring_full():
+    r = SensorRing(capacity=2, msg_size=1)
+    assert r.write(b"a")
+    assert r.write(b"b")
+    assert not r.write(b"c")
+    assert r.get() == [b"a", b"b"]
+    assert r.write(b"d")
+    assert r.get() == [b"d"]
+
+
+def _write_messages(ring, count):
+    for i in range(count):
+        while not ring.write(i.to_bytes(2, "little")):
+            pass
+
+
+def test_sensor_ring_across_processes():
+    r = SensorRing(capacity=4, msg_size=2)
+    p = multiprocessing.get_context("spawn").Process(
+        target=_write_messages, args=(r, 100)
+    )
+    p.start()
+    messages = []
+    while len(messages) < 100:
+        messages += r.get(timeout=10)
+    p.join()
+    assert [int.from_bytes(m, "little") for m in messages] == list(range(100))
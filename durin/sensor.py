@@ -4,14 +4,17 @@ import time
 from typing import Generic, NamedTuple, Tuple, TypeVar
 
 import numpy as np
+from durin import io
 from durin.io import SENSORS
 
 from durin.io.network import UDPLink
 from durin.io.runnable import RunnableConsumer
-from durin.io.ringbuffer import RingBuffer
 
 T = TypeVar("T")
 
+# Monotonic clock for update intervals, immune to wall-clock adjustments
+_now = time.monotonic_ns
+
 
 class Observation(NamedTuple):
     tof: np.ndarray = np.zeros((8, 8, 8))
@@ -22,8 +25,10 @@ class Observation(NamedTuple):
     frequency: float = 0
 
     def __repr__(self) -> str:
-        tof_str = " ".join([f"{x.mean():.0f}±{x.std():.0f}" for x in self.tof])
-        return f"Durin {self.battery}%\n\tIMU: {self.imu}\n\tTOF: {tof_str}"
+        means = self.tof.mean(axis=(1, 2))
+        stds = self.tof.std(axis=(1, 2))
+        tof_str = " ".join(f"{m:.0f}±{s:.0f}" for m, s in zip(means, stds))
+        return f"Durin {self.charge}%\n\tIMU: {self.imu}\n\tTOF: {tof_str}"
 
 
 class Sensor(ABC, Generic[T]):
@@ -39,28 +44,64 @@ class DurinSensor(RunnableConsumer, Sensor[Observation]):
         self.tof = context.Array("f", 8 * 8 * 8)
         self.charge = context.Value("f", 0)
         self.voltage = context.Value("f", 0)
-        self.imu = context.Array("d", 3 * 3)
+        self.imu = context.Array("f", 3 * 3)
         self.uwb = context.Value("d", 0)
-        self.ringbuffer = context.Array("d", 50)
+        self.ringbuffer = context.Array("f", 50)
         self.ringbuffer_idx = context.Value("i", 0)
-        self.timestamp_update = context.Value("d", time.time())
+        self.timestamp_update = context.Value("q", _now())
+
+        self._create_views()
 
+        # The tof, imu and ringbuffer arrays are written through the views,
+        # which are recreated in the consumer process, so they are not passed on
         super().__init__(
             self.link.buffer,
-            self.tof,
             self.charge,
             self.voltage,
-            self.imu,
             self.uwb,
-            self.ringbuffer,
             self.ringbuffer_idx,
             self.timestamp_update,
         )
 
-    def read(self) -> Observation:
-        tof = np.frombuffer(self.tof.get_obj(), dtype=np.float32).reshape((8, 8, 8))
-        imu = np.frombuffer(self.imu.get_obj()).reshape((3, 3))
-        frequency = 1 / (np.frombuffer(self.ringbuffer.get_obj()).mean() + 1e-7)
+    def _create_views(self):
+        # NumPy views over the shared memory, created once since the
+        # underlying buffers never move
+        self._tof_view = np.frombuffer(self.tof.get_obj(), dtype=np.float32).reshape(
+            (8, 8, 8)
+        )
+        self._imu_view = np.frombuffer(self.imu.get_obj(), dtype=np.float32).reshape(
+            (3, 3)
+        )
+        self._ring_view = np.frombuffer(self.ringbuffer.get_obj(), dtype=np.float32)
+
+    def __getstate__(self):
+        # Pickling the views would copy the arrays, so they are recreated over
+        # the shared memory in the consumer process instead
+        state = self.__dict__.copy()
+        for view in ("_tof_view", "_imu_view", "_ring_view"):
+            state.pop(view, None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._create_views()
+
+    def read(self, snapshot: bool = False) -> Observation:
+        """
+        Reads the latest sensor values.
+
+        Note that by default the tof and imu arrays are live views of the shared
+        memory and change as new packets arrive.
+
+        Arguments:
+            snapshot (bool): Copy the arrays so the observation does not change afterwards. Defaults to False.
+        """
+        tof = self._tof_view
+        imu = self._imu_view
+        if snapshot:
+            tof = tof.copy()
+            imu = imu.copy()
+        frequency = 1e9 / (self._ring_view.mean() + 1)
         return Observation(
             tof,
             charge=self.charge.value,
@@ -81,33 +122,31 @@ class DurinSensor(RunnableConsumer, Sensor[Observation]):
     def consume(
         self,
         item,
-        tof,
         charge,
         voltage,
-        imu,
         uwb,
-        ringbuffer,
         ringbuffer_idx,
         timestamp_update,
     ):
-        (sensor_id, data) = item
-        if sensor_id >= SENSORS["tof_a"] and sensor_id <= SENSORS["tof_d"]:
-            # Multiply by two since each package contains data from two sensors
-            idx = (sensor_id - SENSORS["tof_a"]) * 2
-            # We assign a flattened (2, 8, 8) array
-            tof.get_obj()[idx * 64 : (idx + 2) * 64] = data.reshape(-1)
-        if sensor_id == SENSORS["misc"]:
-            charge.value = data[0]
-            voltage.value = data[1]
-            imu.get_obj()[:] = data[2].reshape(-1)
-        # if sensor_id == SENSORS["uwb"]:
-        #     obs.uwb[:] = data
-
-        # Update Hz
-        time_now = time.time()
-        buffer = RingBuffer(np.frombuffer(ringbuffer.get_obj()))
-        buffer.counter = ringbuffer_idx.value
-        buffer.append(time_now - timestamp_update.value)
-        ringbuffer.get_obj()[:] = buffer.buffer
-        ringbuffer_idx.value = buffer.counter
-        timestamp_update.value = time_now
+        # Items arrive as batches of raw packets
+        for packet in item:
+            (sensor_id, data) = io.decode(packet)
+            if sensor_id >= SENSORS["tof_a"] and sensor_id <= SENSORS["tof_d"]:
+                # Multiply by two since each package contains data from two sensors
+                idx = (sensor_id - SENSORS["tof_a"]) * 2
+                # Copy the (2, 8, 8) array through the NumPy view rather than
+                # element-wise through ctypes
+                self._tof_view[idx : idx + 2] = data
+            if sensor_id == SENSORS["misc"]:
+                charge.value = data[0]
+                voltage.value = data[1]
+                self._imu_view[:] = data[2]
+            # if sensor_id == SENSORS["uwb"]:
+            #     obs.uwb[:] = data
+
+            # Update Hz (intervals in nanoseconds)
+            time_now = _now()
+            i = ringbuffer_idx.value
+            self._ring_view[i] = time_now - timestamp_update.value
+            ringbuffer_idx.value = (i + 1) % len(self._ring_view)
+            timestamp_update.value = time_now